@@ -2,7 +2,14 @@
 import argparse
 import csv
 import json
-from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+
+# orjson serializes in C and is much faster than json for the full template, but only indents by 2
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 REQUIRED_CSV_COLS = {
     "reference", "book_sequence", "book_abbrev", "chapter", "chapter_sequence", "verse", "verse_sequence"
@@ -20,66 +27,76 @@ def load_books(path):
     return books, name_to_book
 
 def read_csv(path):
-    rows = []
+    # Yields rows one at a time so build_output can stream through large CSVs
     with open(path, newline="", encoding="utf-8-sig") as f:
-        rdr = csv.DictReader(f)
-        #print(rdr.fieldnames)
-        missing = REQUIRED_CSV_COLS - set(rdr.fieldnames or [])
+        rdr = csv.reader(f)
+        fieldnames = next(rdr, [])
+        missing = REQUIRED_CSV_COLS - set(fieldnames)
         if missing:
             raise ValueError(f"CSV missing required columns: {', '.join(sorted(missing))}")
+        # Plain csv.reader with fixed column positions; DictReader builds a full dict per row
+        col = {name: fieldnames.index(name) for name in REQUIRED_CSV_COLS}
+        ref_i, book_seq_i, abbrev_i = col["reference"], col["book_sequence"], col["book_abbrev"]
+        chap_i, chap_seq_i = col["chapter"], col["chapter_sequence"]
+        verse_i, verse_seq_i = col["verse"], col["verse_sequence"]
         for r in rdr:
-            r["book_sequence"]   = int(r["book_sequence"])
-            r["chapter"]         = int(r["chapter"])
-            r["chapter_sequence"]= int(r["chapter_sequence"])
-            r["verse"]           = int(r["verse"])
-            r["verse_sequence"]  = int(r["verse_sequence"])
-            r["book_abbrev"]     = r["book_abbrev"].strip()
-            rows.append(r)
-    return rows
+            yield {
+                "reference":        r[ref_i],
+                "book_sequence":    int(r[book_seq_i]),
+                "book_abbrev":      r[abbrev_i].strip(),
+                "chapter":          int(r[chap_i]),
+                "chapter_sequence": int(r[chap_seq_i]),
+                "verse":            int(r[verse_i]),
+                "verse_sequence":   int(r[verse_seq_i]),
+            }
 
 def build_output(books_meta, name_map, refs):
-    # Group refs by canonical book name resolved via 3-letter abbrev
-    per_book = defaultdict(list)
-    for r in refs:
-        key = r["book_abbrev"].lower()
-        # Per instructions, abbrev always exists in names
-        canonical_book = name_map[key]["book"]
-        per_book[canonical_book].append(r)
-
-    # Derive book_sequence from CSV rows
-    book_seq = {bname: min(r["book_sequence"] for r in rows)
-                for bname, rows in per_book.items()}
-
     # Canonical metadata
     meta_by_name = {b["book"]: b for b in books_meta}
 
-    # Order books by book_sequence
-    ordered_books = sorted(per_book.keys(), key=lambda b: book_seq[b])
+    # Every verse gets the same empty cross references; the output is only serialized,
+    # so one shared (read-only) instance saves a dict and two lists per verse
+    empty_cross_references = {"refers_to": [], "refers_me": []}
 
-    # Build chapters and verses per book (chapter_sequence assigned later globally)
+    # Canonical book name resolved via 3-letter abbrev
+    # (per instructions, abbrev always exists in names)
+    abbrev_to_canonical = {name: b["book"] for name, b in name_map.items()}
+    def canonical_book(r):
+        return abbrev_to_canonical[r["book_abbrev"].lower()]
+
+    # Build chapters and verses per book (chapter_sequence assigned later globally).
+    # The CSV lists each book's rows, and each chapter's rows, together, so they are
+    # grouped in one streaming pass instead of collecting every row first
     books_out = []
     chapters_index = []  # (book_name, chapter_obj) to assign global chapter_sequence later
-    for bname in ordered_books:
+    seen_books = set()
+    for bname, rows in groupby(refs, key=canonical_book):
+        if bname in seen_books:
+            raise ValueError(f"CSV rows for {bname} are not contiguous")
+        seen_books.add(bname)
         meta = meta_by_name[bname]
-        rows = per_book[bname]
-
-        # Group by chapter
-        by_chapter = defaultdict(list)
-        for r in rows:
-            by_chapter[r["chapter"]].append(r)
+        # Derive book_sequence from CSV rows
+        book_seq = None
 
         chapter_objs = []
-        for chap_num in sorted(by_chapter.keys()):
-            vrows = by_chapter[chap_num]
-            vrows.sort(key=lambda x: (x["verse_sequence"], x["verse"]))
-            verses = [{
-                "heading": None,
-                "verse_sequence": vr["verse_sequence"],
-                "verse": vr["verse"],
-                "text": None,
-                "cross_references": {"refers_to": [], "refers_me": []},
-                "footnote": None
-            } for vr in vrows]
+        seen_chapters = set()
+        for chap_num, vrows in groupby(rows, key=itemgetter("chapter")):
+            if chap_num in seen_chapters:
+                raise ValueError(f"CSV rows for {bname} {chap_num} are not contiguous")
+            seen_chapters.add(chap_num)
+            vrows = sorted(vrows, key=lambda x: (x["verse_sequence"], x["verse"]))
+            verses = []
+            for vr in vrows:
+                if book_seq is None or vr["book_sequence"] < book_seq:
+                    book_seq = vr["book_sequence"]
+                verses.append({
+                    "heading": None,
+                    "verse_sequence": vr["verse_sequence"],
+                    "verse": vr["verse"],
+                    "text": None,
+                    "cross_references": empty_cross_references,
+                    "footnote": None
+                })
             
             # Get chapter_sequence from CSV (all rows for this chapter should have same value)
             chapter_sequence = vrows[0]["chapter_sequence"]
@@ -93,24 +110,36 @@ def build_output(books_meta, name_map, refs):
             chapter_objs.append(ch_obj)
             chapters_index.append((bname, ch_obj))
 
+        chapter_objs.sort(key=itemgetter("chapter"))
         books_out.append({
             "book": bname,
-            "book_sequence": book_seq[bname],
+            "book_sequence": book_seq,
             "testament": meta.get("testament"),
             "names": meta.get("names", []),
             "num_chapters": len(chapter_objs),
             "chapters": chapter_objs
         })
 
+    # Order books by book_sequence
+    books_out.sort(key=itemgetter("book_sequence"))
 
     return books_out
 
+def write_json(path, obj, indent):
+    if orjson is not None and indent == 2:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    # json.dump writes every token separately; serialize once and write in one go
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(obj, ensure_ascii=False, indent=indent))
+
 def main():
     ap = argparse.ArgumentParser(description="Build nested Bible JSON from books.json and references CSV.")
     ap.add_argument("--json", default="./books.json", help="Path to books JSON")
     ap.add_argument("--csv", default="./books.csv", help="Path to references CSV")
     ap.add_argument("--out", default="./version_template.json", help="Path to write output JSON")
-    ap.add_argument("--indent", type=int, default=4, help="JSON indent (default 4)")
+    ap.add_argument("--indent", type=int, default=4, help="JSON indent (default 4; 2 uses orjson if installed)")
     args = ap.parse_args()
 
     books_meta, name_map = load_books(args.json)
@@ -125,8 +154,7 @@ def main():
         "books": books
     }
 
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=args.indent)
+    write_json(args.out, out, args.indent)
 
 if __name__ == "__main__":
     main()
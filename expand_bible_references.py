@@ -2,10 +2,28 @@
 import sys
 import argparse
 import json
+import os
 import re
 import errno
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, TextIO
+from typing import Iterator, Optional, TextIO
+
+# Use the linear-time RE2 engine for the reference scan when it is installed
+try:
+    import re2 as re_engine
+except ImportError:
+    re_engine = re
+
+# orjson parses the translation files in C, noticeably faster than json; it builds the same dicts and lists
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_LEADING_VERSENUM_RE = re.compile(r'^\d+')
+# One comma-separated part of a reference: "3:23", "1:1-2:3", or a bare verse or verse range ("14", "9-13")
+_VERSE_PART_RE = re.compile(r'(?:(?P<chapter>\d+):)?(?P<start_verse>\d+)(?:-(?:(?P<end_chapter>\d+):)?(?P<end_verse>\d+))?')
 
 def parse_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -24,11 +42,11 @@ def parse_arguments() -> argparse.Namespace:
     
     # Arguments only valid with version (not with --list-versions)
     parser.add_argument('-f', '--file',
-                        type=argparse.FileType('r'),
+                        type=argparse.FileType('r', encoding='utf-8'),
                         metavar='INFILE',
                         help='Input file (default: stdin)')
     parser.add_argument('-o', '--out',
-                        type=argparse.FileType('w'),
+                        type=argparse.FileType('w', encoding='utf-8'),
                         metavar='OUTFILE',
                         help='Output file (default: stdout)')
     parser.add_argument('-l', '--limit', '--limit-verses',
@@ -44,15 +62,19 @@ def parse_arguments() -> argparse.Namespace:
                         default='`',
                         dest='surround_char',
                         help='Character to surround verse text with (default: `)')
+    parser.add_argument('-j', '--jobs',
+                        type=int,
+                        metavar='N',
+                        default=1,
+                        help='Expand the text in N worker processes (0: one per CPU, default: 1)')
     
     args = parser.parse_args()
 
     if args.list_versions:
         translations_dir = Path(__file__).parent / 'translations'
-        versions = [f.stem.replace('bible_', '').upper() for f in translations_dir.glob('bible_*.json')]
         print("Available Bible versions:")
-        for v in versions:
-            print(f" - {v}")
+        for f in sorted(translations_dir.glob('bible_*.json')):
+            print(f" - {f.stem.removeprefix('bible_').upper()}")
         sys.exit(0)
 
     # Validate version is provided when not listing
@@ -66,21 +88,57 @@ def parse_arguments() -> argparse.Namespace:
     if args.limit is None:
         args.limit = float('inf')
 
+    # Validate jobs
+    if args.jobs < 0:
+        parser.error("Jobs must be a non-negative integer")
+
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+
     return args
 
+def bible_version_path(version: str) -> Path:
+    """Return the JSON file of the specified Bible version, exiting if there is none."""
+    version_path = Path(__file__).parent / 'translations' / f'bible_{version.upper()}.json'
+    if not version_path.is_file():
+        print(f"Error: Bible version '{version}' not found", file=sys.stderr)
+        sys.exit(1)
+    return version_path
+
+@lru_cache(maxsize=None)
 def load_bible_version(version: str) -> dict:
     """Load the specified Bible version from JSON file."""
+    version_path = bible_version_path(version)
     try:
-        version_path = Path(__file__).parent / 'translations' / f'bible_{version.upper()}.json'
+        if orjson is not None:
+            with open(version_path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(version_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except FileNotFoundError:
         print(f"Error: Bible version '{version}' not found", file=sys.stderr)
         sys.exit(1)
-    except json.JSONDecodeError:
+    except json.JSONDecodeError:  # orjson.JSONDecodeError is a subclass
         print(f"Error: Invalid JSON in Bible version file", file=sys.stderr)
         sys.exit(1)
 
+def build_bible_index(bible_data: dict) -> dict[str, dict]:
+    """Index the Bible data by book name and chapter number for direct lookups.
+    
+    Each chapter maps to a list of "N text" verse strings indexed by verse number (index 0 is unused).
+    """
+    index = {}
+    for b in bible_data['books']:
+        chapters = {}
+        for c in b['chapters']:
+            verse_texts = [None] * (max((v['verse'] for v in c['verses']), default=0) + 1)
+            for v in c['verses']:
+                verse_texts[v['verse']] = f"{v['verse']} {v['text']}"
+            chapters[c['chapter']] = verse_texts
+        index[b['book']] = {'chapters': chapters}
+    return index
+
+@lru_cache(maxsize=1)
 def load_book_names() -> dict[str, str]:
     """Load book names and their variations from books.json."""
     try:
@@ -96,136 +154,110 @@ def load_book_names() -> dict[str, str]:
         print("Error: Could not load books.json", file=sys.stderr)
         sys.exit(1)
 
-def expand_comma_references(full_ref: str, book_name: str) -> list[str]:
-    """Expand comma-separated references like 'Romans 3:23, 6:23, 8:1' into individual references."""
-    # Extract the reference part after the book name
-    ref_without_book = full_ref[len(book_name):].strip()
-    
-    # Split by commas
-    parts = [p.strip() for p in ref_without_book.split(',')]
-    
+# Numbered-book prefix: "1", "1 ", "1st ", "First "
+_BOOK_PREFIX = r'(?:[123](?:st|nd|rd)? ?|(?:first|second|third) )'
+
+def compile_reference_pattern(book_names: dict[str, str]) -> re.Pattern:
+    """Compile the Bible reference regex for the known book names."""
+    # Book names are matched by shape and checked against book_names in match_references: a
+    # 300-name alternation scans several times slower under the stdlib re. Only the words in
+    # front of the last word of multi-word names (the "Song of" of "Song of Solomon") are
+    # spelled out, so the scan still only tries one word before the chapter number.
+    leading_words = set()
+    for name in book_names:
+        name = re.sub(rf'(?i)^{_BOOK_PREFIX}', '', name)
+        if ' ' in name:
+            leading_words.add(name.rsplit(' ', 1)[0] + ' ')
+    leading_alt = '|'.join(re.escape(words) for words in sorted(leading_words, key=len, reverse=True))
+    # Pattern matches:
+    # - Book name (optional book number, optional leading words, last word)
+    # - Chapter number
+    # - Verse number
+    # - Optional verse range
+    # - Optional chapter-verse range
+    # - Optional verse-part letter ("16a")
+    # - Further verses or chapter:verses after commas, each ending at a word boundary so
+    #   the "1" of a following "1st John" is not taken for a verse
+    # Example: "Romans 3:23, 6:23, 8:1" or "John 1:1-5,9-13, 14, 2:3"
+    return re_engine.compile(
+        rf'(?i)\b(?P<book>(?P<prefix>{_BOOK_PREFIX})?(?P<lead>{leading_alt})?(?P<name>[a-z]+)) ?'
+        rf'(?P<refs>\d+:\d+(?:-\d+(?::\d+)?)?(?:[a-z]\b)?(?:, ?\d+(?::\d+)?(?:-\d+(?::\d+)?)?(?:[a-z]\b)?\b)*)'
+    )
+
+_REF_RE = compile_reference_pattern(load_book_names())
+
+def expand_comma_references(book_name: str, refs: str, canonical_book: str) -> list[tuple[str, tuple[str, int, Optional[int], Optional[int], Optional[int]]]]:
+    """Expand comma-separated references like 'Romans 3:23, 6:23, 8:1' into (reference, parsed reference) pairs."""
     expanded = []
     current_chapter = None
     
-    for part in parts:
-        if ':' in part:
+    for part in _VERSE_PART_RE.finditer(refs):
+        chapter_text, start_verse, end_chapter, end_verse = part.groups()
+        if chapter_text:
             # Full chapter:verse reference
-            chapter_verse = part.split(':')
-            current_chapter = chapter_verse[0]
-            expanded.append(f"{book_name} {part}")
+            current_chapter = chapter_text
+            chapter = int(chapter_text)
+            ref = f"{book_name} {part.group()}"
         else:
             # Just a verse number or verse range, use current chapter
-            if current_chapter:
-                expanded.append(f"{book_name} {current_chapter}:{part}")
-            else:
-                # Invalid reference, skip
-                continue
+            ref = f"{book_name} {current_chapter}:{part.group()}"
+        
+        start_verse = int(start_verse)
+        end_chapter = int(end_chapter) if end_chapter else chapter
+        end_verse = int(end_verse) if end_verse else start_verse
+        expanded.append((ref, (canonical_book, chapter, start_verse, end_chapter, end_verse)))
                 
     return expanded
 
-def find_bible_references(text: str) -> list[tuple[str, int, int]]:
-    """Find all Bible references in text and return list of (reference, start, end) tuples."""
-    # Load book names for validation
-    book_names = load_book_names()
+def match_references(match: re.Match, book_names: dict[str, str]) -> list[tuple[str, tuple[str, int, Optional[int], Optional[int], Optional[int]]]]:
+    """Expand a reference regex match into (reference, parsed reference) pairs."""
+    book_name = match.group('book')
+    # Lower-cased once and reused for the last-word retry below
+    book_key = book_name.lower()
+    canonical_book = book_names.get(book_key)
+    if canonical_book is None:
+        # Leading words may be prose rather than part of the name ("Song Psalm 23:1"), but a book
+        # number never is: "2 Jhn" must not fall back to the Gospel of John
+        if match.group('prefix') or not match.group('lead'):
+            return []
+        book_name = match.group('name')
+        canonical_book = book_names.get(book_key[-len(book_name):])
+        if canonical_book is None:
+            return []
+    return expand_comma_references(book_name, match.group('refs'), canonical_book)
+
+def find_bible_references(text: str, book_names: dict[str, str]) -> list[tuple[str, tuple[str, int, Optional[int], Optional[int], Optional[int]], int, int]]:
+    """Find all Bible references in text and return list of (reference, parsed reference, start, end) tuples.
     
-    # Pattern matches:
-    # - Optional book number (1, 2, 3)
-    # - Book name
-    # - Chapter number
-    # - Optional verse number
-    # - Optional verse range
-    # - Optional chapter-verse range
-    # - Chapter and verse with optional commas for multiple refs
-    # Example: "Romans 3:23, 6:23, 8:1" or "John 1:1-5,9-13, 14, 2:3"
-    pattern = r'(?:[123] ?)?[A-Za-z]+(?: [oO][fF] (?:(?i:Songs)|(?i:Solomon)))? ?\d+:\d+(?:-\d+(?::\d+)?)?(?:, ?\d+(?::\d+)?(?:-\d+(?::\d+)?)?)*'
+    Each reference is only listed at its first occurrence within a line.
+    """
     references = []
+    seen = set()
+    scanned = 0
     
-    for match in re.finditer(pattern, text):
-        ref = match.group().strip()
-        # Split into book name and reference part
-        parts = ref.split()
+    for match in _REF_RE.finditer(text):
+        # References never span lines; start over on the first match past a line break
+        if text.rfind('\n', scanned, match.start()) != -1:
+            seen.clear()
+        scanned = match.end()
         
-        # Handle multi-word book names
-        if parts[0] in ('1', '2', '3'):
-            if 'of' in parts[1].lower() or (len(parts) > 2 and 'of' in parts[2].lower()):
-                # Handle "Song of Solomon" etc
-                book_idx = next((i for i, p in enumerate(parts) if ':' in p), len(parts))
-                book_name = ' '.join(parts[:book_idx])
-            else:
-                book_name = ' '.join(parts[:2])
-        elif 'of' in ref.lower():
-            # Multi-word book like "Song of Solomon"
-            book_idx = next((i for i, p in enumerate(parts) if ':' in p), len(parts))
-            book_name = ' '.join(parts[:book_idx])
-        else:
-            book_name = parts[0]
-            
-        # Validate book name
-        if book_name.lower() not in book_names:
-            continue
-            
         # Expand comma-separated references
-        expanded_refs = expand_comma_references(ref, book_name)
+        expanded_refs = match_references(match, book_names)
         
-        # Add each expanded reference with the same position
-        for expanded_ref in expanded_refs:
-            references.append((expanded_ref, match.start(), match.end()))
+        # Add each new expanded reference with the same position
+        for expanded_ref, parsed_reference in expanded_refs:
+            if expanded_ref in seen:
+                continue
+            seen.add(expanded_ref)
+            references.append((expanded_ref, parsed_reference, match.start(), match.end()))
             
     return references
 
-def parse_reference(reference: str, book_names: dict) -> Optional[tuple[str, int, Optional[int], Optional[int], Optional[int]]]:
-    """Parse a Bible reference into its components."""
-    parts = reference.split(' ')
-    
-    # Handle book name (including multi-word books)
-    if parts[0] in ('1', '2', '3'):
-        book_name = ' '.join(parts[:2]).lower()
-        ref_part = ' '.join(parts[2:])
-    else:
-        book_name = parts[0].lower()
-        ref_part = ' '.join(parts[1:])
-    
-    canonical_book = book_names.get(book_name)
-    if not canonical_book:
-        return None
-        
-    # Parse chapter and verse references
-    chapter_verse = ref_part.split(':')
-    chapter = int(chapter_verse[0])
-    
-    start_verse = end_verse = None
-    end_chapter = None
-    
-    if len(chapter_verse) > 1:
-        verse_range = chapter_verse[1]
-        if '-' in verse_range:
-            # Handle verse ranges
-            verse_parts = verse_range.split('-')
-            start_verse = int(verse_parts[0])
-            
-            if ':' in verse_parts[1]:
-                # Handle chapter-verse range (e.g., 1:1-2:3)
-                chap_verse = verse_parts[1].split(':')
-                end_chapter = int(chap_verse[0])
-                end_verse = int(chap_verse[1])
-            else:
-                # Handle simple verse range (e.g., 1:1-3)
-                end_verse = int(verse_parts[1])
-        else:
-            # Single verse
-            start_verse = end_verse = int(verse_range)
-            
-    return canonical_book, chapter, start_verse, end_chapter or chapter, end_verse
-
-def get_verse_text(bible_data: dict, surround_char: str, parsed_reference: tuple[str, int, Optional[int], Optional[int], Optional[int]]) -> Optional[str]:
+def get_verse_text(bible_index: dict[str, dict], surround_char: str, parsed_reference: tuple[str, int, Optional[int], Optional[int], Optional[int]]) -> Optional[str]:
     """Get the verse text for a given reference."""
     # Find the book in the Bible data
     book, start_chapter, start_verse, end_chapter, end_verse = parsed_reference
-    book_data = None
-    for b in bible_data['books']:
-        if b['book'] == book:
-            book_data = b
-            break
+    book_data = bible_index.get(book)
     
     if not book_data:
         return None
@@ -240,14 +272,14 @@ def get_verse_text(bible_data: dict, surround_char: str, parsed_reference: tuple
         return None
     # Collect all verses in the range
     for chapter in range(start_chapter, end_chapter + 1):
-        chapter_data = next((c for c in book_data['chapters'] if c['chapter'] == chapter), None)
-        if not chapter_data:
+        verse_texts = book_data['chapters'].get(chapter)
+        if not verse_texts:
             continue
             
         verse_start = start_verse if chapter == start_chapter else 1
-        verse_end = end_verse if chapter == end_chapter else len(chapter_data['verses'])
+        verse_end = end_verse if chapter == end_chapter else len(verse_texts) - 1
         
-        verses.extend(f"{v['verse']} {v['text']}" for v in chapter_data['verses'] if verse_start <= v['verse'] <= (verse_end or verse_start))
+        verses.extend(t for t in verse_texts[max(verse_start, 1):verse_end + 1] if t is not None)
     
     if not verses:
         return None
@@ -262,108 +294,174 @@ def get_verse_text(bible_data: dict, surround_char: str, parsed_reference: tuple
             else:
                 formatted_ref += f"-{end_verse}"
     verse = ' '.join(verses)
-    verse = re.sub(r'^\d+', '', verse)  # Remove leading verse number
+    verse = _LEADING_VERSENUM_RE.sub('', verse)  # Remove leading verse number
     return f"{surround_char}{verse.strip().rstrip(',.')}{surround_char}"
 
-def count_verses(bible_data: dict, parsed_reference: tuple[str, int, Optional[int], Optional[int], Optional[int]]) -> int:
+def count_verses(bible_index: dict[str, dict], parsed_reference: tuple[str, int, Optional[int], Optional[int], Optional[int]]) -> int:
     """Count the number of verses in a given reference."""
     book, start_chapter, start_verse, end_chapter, end_verse = parsed_reference
-    book_data = None
-    for b in bible_data['books']:
-        if b['book'] == book:
-            book_data = b
-            break
+    book_data = bible_index.get(book)
     
     if not book_data or start_verse is None or end_chapter is None:
         return 0
     
-    count = 0
-    for chapter in range(start_chapter, end_chapter + 1):
-        chapter_data = next((c for c in book_data['chapters'] if c['chapter'] == chapter), None)
-        if not chapter_data:
-            continue
-            
-        verse_start = start_verse if chapter == start_chapter else 1
-        verse_end = end_verse if chapter == end_chapter else len(chapter_data['verses'])
-        
-        count += sum(1 for v in chapter_data['verses'] if verse_start <= v['verse'] <= (verse_end or verse_start))
+    # Verses are numbered 1..N in order (see version_template.json), so each chapter's share is a subtraction
+    chapters = book_data['chapters']
+    if start_chapter == end_chapter:
+        verse_texts = chapters.get(start_chapter)
+        return max(0, min(end_verse, len(verse_texts) - 1) - max(start_verse, 1) + 1) if verse_texts else 0
+    if end_chapter < start_chapter:
+        return 0
     
+    # Rest of the start chapter, whole middle chapters, then the head of the end chapter
+    first_texts = chapters.get(start_chapter)
+    last_texts = chapters.get(end_chapter)
+    count = max(0, len(first_texts) - max(start_verse, 1)) if first_texts else 0
+    count += sum(len(chapters[c]) - 1 for c in range(start_chapter + 1, end_chapter) if c in chapters)
+    count += max(0, min(end_verse, len(last_texts) - 1)) if last_texts else 0
     return count
 
-def process_text(text: str, bible_data: dict, after_paragraph: bool, verse_limit: int, verse_text_surround_char: str) -> str:
-    """Process text and expand/insert Bible references."""
+def lookup_reference(ref: str, parsed_reference: tuple[str, int, Optional[int], Optional[int], Optional[int]], bible_index: dict[str, dict], verse_limit: int, surround_char: str) -> Optional[str]:
+    """Get the verse text to insert for a single reference, or None to leave it unexpanded."""
+    if verse_limit is None or count_verses(bible_index, parsed_reference) > verse_limit:
+        return None
+    verse_text = get_verse_text(bible_index, surround_char, parsed_reference)
+    if verse_text is None:
+        # Skip invalid references but preserve the original text
+        print(f"Warning: Could not process reference '{ref}'", file=sys.stderr)
+    return verse_text
+
+def process_text(text: str, bible_index: dict[str, dict], book_names: dict[str, str], after_paragraph: bool, verse_limit: int, verse_text_surround_char: str, verse_cache: Optional[dict] = None) -> str:
+    """Process text and expand/insert Bible references.
+    
+    Verse lookups are memoized in verse_cache by parsed reference; pass the same dict to
+    every call that uses the same Bible, limit and surround char to share it.
+    """
     if not text:
         return text
         
-    references = find_bible_references(text)
+    if verse_cache is None:
+        verse_cache = {}
+    
+    def cached_lookup(ref: str, parsed_reference: tuple[str, int, Optional[int], Optional[int], Optional[int]]) -> Optional[str]:
+        if parsed_reference not in verse_cache:
+            verse_cache[parsed_reference] = lookup_reference(ref, parsed_reference, bible_index, verse_limit, verse_text_surround_char)
+        return verse_cache[parsed_reference]
+    
+    if not after_paragraph:
+        seen = set()
+        scanned = 0
+        
+        def expand_match(match: re.Match) -> str:
+            nonlocal scanned
+            # Same per-line deduplication as find_bible_references
+            if text.rfind('\n', scanned, match.start()) != -1:
+                seen.clear()
+            scanned = match.end()
+            
+            verses = []
+            for ref, parsed_reference in match_references(match, book_names):
+                if ref in seen:
+                    continue
+                seen.add(ref)
+                verse_text = cached_lookup(ref, parsed_reference)
+                if verse_text is not None:
+                    verses.append(verse_text)
+            if not verses:
+                return match.group()
+            # Insert verse text right after the reference, followed by a space unless one is already there
+            needs_space_after = not text.startswith(' ', match.end())
+            return match.group() + ''.join(f" {v}" for v in verses) + (' ' if needs_space_after else '')
+        
+        return _REF_RE.sub(expand_match, text)
+    
+    references = find_bible_references(text, book_names)
     if not references:
         return text
 
-    seen = set()
-    references = [ref for ref in references if not (ref[0] in seen or seen.add(ref[0]))]
-
-    # Process references in reverse order to maintain correct string indices
-    references.reverse()
-    result = text
-
-    book_names = load_book_names()
+    # Collect (position, text) insertions in document order, then splice them in a single pass
+    insertions = []
     
-    for ref, start, end in references:
-        parsed_reference = parse_reference(ref, book_names)
-        if not parsed_reference:
-            continue
-        if verse_limit is None or count_verses(bible_data, parsed_reference) > verse_limit:
-            continue
-        verse_text = get_verse_text(bible_data, verse_text_surround_char, parsed_reference)
+    for ref, parsed_reference, start, end in references:
+        verse_text = cached_lookup(ref, parsed_reference)
         if verse_text is None:
-            # Skip invalid references but preserve the original text
-            print(f"Warning: Could not process reference '{ref}'", file=sys.stderr)
             continue
             
-        if after_paragraph:
-            # Find the next newline after the reference
-            next_newline = result.find('\n', end)
-            verse_text = f"{ref} {verse_text}"
-            if next_newline == -1:
-                # If no newline found, append to end with proper spacing
-                if not result.endswith('\n'):
-                    result += '\n'
-                result += verse_text + '\n'
-            else:
-                # Insert after the newline with proper spacing
-                # Check if we need to add a newline after the verse
-                needs_newline = not result[next_newline + 1:].startswith('\n')
-                result = (
-                    result[:next_newline + 1] +  # Keep text up to newline
-                    verse_text +                  # Add verse text
-                    ('\n' if needs_newline else '') +  # Add newline if needed
-                    result[next_newline + 1:]     # Rest of the text
-                )
-        else:
-            # Insert verse text right after the reference
-            # Check if we need spaces around the verse text
-            needs_space_before = result[start:start + 1] != ' '
-            needs_space_after = result[end:end + 1] != ' '
-            
-            result = (
-                result[:end] +
-                (' ' if needs_space_before else '') +
-                verse_text +
-                (' ' if needs_space_after else '') +
-                result[end:]
-            )
+        # Each verse goes on its own line below the line holding the reference
+        line_end = text.find('\n', end)
+        insertions.append((len(text) if line_end == -1 else line_end, f"\n{ref} {verse_text}"))
     
-    return result
+    pieces = []
+    cursor = 0
+    for i, (pos, insert) in enumerate(insertions):
+        pieces.append(text[cursor:pos])
+        pieces.append(insert)
+        cursor = pos
+        # Close the last verse line, which leaves a blank line before the text that follows
+        if i + 1 == len(insertions) or insertions[i + 1][0] != pos:
+            pieces.append('\n')
+    pieces.append(text[cursor:])
+    
+    return ''.join(pieces)
+
+def split_into_blocks(text: str, count: int) -> list[str]:
+    """Split text into about count blocks of whole lines."""
+    blocks = []
+    size = len(text) // count
+    start = 0
+    while start < len(text):
+        end = text.find('\n', start + size)
+        end = len(text) if end == -1 else end + 1
+        blocks.append(text[start:end])
+        start = end
+    return blocks
+
+# Expansion settings of a worker process, set once by init_worker
+_worker_state = None
+
+def init_worker(bible_index: dict[str, dict], book_names: dict[str, str], after_paragraph: bool, verse_limit: int, verse_text_surround_char: str) -> None:
+    """Store the expansion settings in a worker process so they are not sent along with every block."""
+    global _worker_state
+    _worker_state = (bible_index, book_names, after_paragraph, verse_limit, verse_text_surround_char, {})
+
+def expand_block_in_worker(block: str) -> str:
+    """Expand a block of lines using the settings stored by init_worker."""
+    bible_index, book_names, after_paragraph, verse_limit, verse_text_surround_char, verse_cache = _worker_state
+    return process_text(block, bible_index, book_names, after_paragraph, verse_limit, verse_text_surround_char, verse_cache)
+
+def expand_text(text: str, bible_index: dict[str, dict], book_names: dict[str, str], after_paragraph: bool, verse_limit: int, verse_text_surround_char: str, jobs: int = 1) -> Iterator[str]:
+    """Expand the references in text, yielding the output in chunks.
+    
+    With jobs == 1 the whole text is expanded in one pass. References are handled line by
+    line, so with jobs > 1 the text is cut into blocks of whole lines that are expanded in
+    a pool of worker processes; the output keeps the input order.
+    """
+    if jobs <= 1:
+        yield process_text(text, bible_index, book_names, after_paragraph, verse_limit, verse_text_surround_char)
+        return
+    
+    # Imported here so single-process runs don't pay for loading multiprocessing at startup
+    from concurrent.futures import ProcessPoolExecutor
+    executor = ProcessPoolExecutor(max_workers=jobs,
+                                   initializer=init_worker,
+                                   initargs=(bible_index, book_names, after_paragraph, verse_limit, verse_text_surround_char))
+    try:
+        # A few blocks per worker keeps them busy when some blocks hold more references than others
+        yield from executor.map(expand_block_in_worker, split_into_blocks(text, jobs * 4))
+    finally:
+        executor.shutdown(cancel_futures=True)
 
 def main():
     args = parse_arguments()
-    bible_data = load_bible_version(args.version)
+    # Check the version up front so a typo fails before waiting on input
+    bible_version_path(args.version)
+    book_names = load_book_names()
     
     try:
         # Handle input
         if args.file:
-            # Read from specified file
-            with open(args.file, 'r', encoding='utf-8') as f:
+            # Read from specified file (already opened by argparse)
+            with args.file as f:
                 text = f.read()
         else:
             # Let shell handle stdin (pipe, redirection, or interactive)
@@ -372,19 +470,23 @@ def main():
         if not text.strip():
             return
         
-        text_paragraphs = text.split('\n')
-        result_paragraphs = [process_text(p, bible_data, args.after_paragraph, args.limit, args.surround_char) if p.strip() else p for p in text_paragraphs]
-        result = '\n'.join(result_paragraphs)
+        if _REF_RE.search(text) is None:
+            # Nothing to expand, so skip loading and indexing the Bible altogether
+            result = [text]
+        else:
+            bible_index = build_bible_index(load_bible_version(args.version))
+            # With several jobs, output is written as blocks are expanded rather than joined into one string first
+            result = expand_text(text, bible_index, book_names, args.after_paragraph, args.limit, args.surround_char, args.jobs)
         
         # Handle output
         if args.out:
-            # Write to specified file
-            with open(args.out, 'w', encoding='utf-8') as f:
-                f.write(result)
+            # Write to specified file (already opened by argparse)
+            with args.out as f:
+                f.writelines(result)
         else:
             # Write to stdout
             try:
-                sys.stdout.write(result)
+                sys.stdout.writelines(result)
                 sys.stdout.flush()
             except BrokenPipeError:
                 # Handle broken pipe (e.g., when piping to 'head')
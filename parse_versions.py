@@ -5,12 +5,25 @@ import re
 from pathlib import Path
 from bs4 import BeautifulSoup
 
+# The lxml tree builder parses much faster than the pure-Python html.parser, so use it when installed
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# Language header option text: "---Language Name (CODE)---", or just "---Language Name---"
+_LANG_RE = re.compile(r'---(.+?)\s*\(([A-Z\-]+)\)---')
+_LANG_FALLBACK_RE = re.compile(r'---(.+?)---')
+# Version option text: "Long Name (SHORTNAME)"
+_SHORTNAME_RE = re.compile(r'\(([A-Z0-9\-]+)\)\s*$')
+
 def parse_versions(html_path: str):
     """Parse the HTML file and extract version shortnames, long names, and language."""
     with open(html_path, 'r', encoding='utf-8') as f:
         html_content = f.read()
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, _HTML_PARSER)
     
     versions = []
     current_language = None
@@ -27,7 +40,7 @@ def parse_versions(html_path: str):
         if 'lang' in option_class:
             # Extract language from the text (between --- markers)
             # Format: "---Language Name (CODE)---"
-            lang_match = re.search(r'---(.+?)\s*\(([A-Z\-]+)\)---', text)
+            lang_match = _LANG_RE.search(text)
             if lang_match:
                 current_language = {
                     'langname': lang_match.group(1).strip(),
@@ -35,7 +48,7 @@ def parse_versions(html_path: str):
                 }
             else:
                 # Fallback if format doesn't match
-                fallback_match = re.search(r'---(.+?)---', text)
+                fallback_match = _LANG_FALLBACK_RE.search(text)
                 if fallback_match:
                     lang_text = fallback_match.group(1).strip()
                     current_language = {
@@ -54,7 +67,8 @@ def parse_versions(html_path: str):
         
         # Extract the shortname from the text (usually in parentheses at the end)
         # Format is typically: "Long Name (SHORTNAME)"
-        match = re.search(r'\(([A-Z0-9\-]+)\)\s*$', text)
+        # get_text(strip=True) drops trailing whitespace, so a shortname can only be there if the text ends with ')'
+        match = _SHORTNAME_RE.search(text) if text.endswith(')') else None
         if match:
             shortname = match.group(1)
             # Remove the shortname from the text to get the long name
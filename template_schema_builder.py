@@ -1,32 +1,46 @@
 from genson import SchemaBuilder
 import json
+from pathlib import Path
 
-# Load JSON data
-with open("version_template.json", "r") as f:
-    data = json.load(f)
+TEMPLATE_PATH = Path("version_template.json")
+SCHEMA_PATH = Path("version_template_schema.json")
 
-# Fill examples
-data['name'] = "Example Bible"
-data['initials'] = "EB"
-data['version'] = "2025"
-data['citation'] = "Example Bible Citation"
-data['books'][0]['chapters'][0]['verses'][0]['heading'] = "example heading"
-data['books'][0]['chapters'][0]['verses'][0]['text'] = "example verse text"
-data['books'][0]['chapters'][0]['verses'][0]['cross_references']['refers_me'].append({"book": "book", "chapter": 1, "verse": 1})
-data['books'][0]['chapters'][0]['verses'][0]['cross_references']['refers_to'].append({"book": "book", "chapter": 1, "verse": 1})
-data['books'][0]['chapters'][0]['verses'][0]['footnote'] = "footnote text"
+def main():
+    # Skip the schema inference when the schema is newer than both the template and this script
+    if SCHEMA_PATH.exists():
+        schema_mtime = SCHEMA_PATH.stat().st_mtime
+        if schema_mtime >= TEMPLATE_PATH.stat().st_mtime and schema_mtime >= Path(__file__).stat().st_mtime:
+            print(f"{SCHEMA_PATH} is up to date")
+            return
 
-# Build schema
-builder = SchemaBuilder(schema_uri="http://json-schema.org/draft-07/schema#")
-builder.add_object(data)
+    # Load JSON data
+    with open(TEMPLATE_PATH, "r") as f:
+        data = json.load(f)
 
-# Get schema as dictionary
-schema = builder.to_schema()
+    # Fill examples
+    data['name'] = "Example Bible"
+    data['initials'] = "EB"
+    data['version'] = "2025"
+    data['citation'] = "Example Bible Citation"
+    data['books'][0]['chapters'][0]['verses'][0]['heading'] = "example heading"
+    data['books'][0]['chapters'][0]['verses'][0]['text'] = "example verse text"
+    data['books'][0]['chapters'][0]['verses'][0]['cross_references']['refers_me'].append({"book": "book", "chapter": 1, "verse": 1})
+    data['books'][0]['chapters'][0]['verses'][0]['cross_references']['refers_to'].append({"book": "book", "chapter": 1, "verse": 1})
+    data['books'][0]['chapters'][0]['verses'][0]['footnote'] = "footnote text"
 
-# Tweak schema
-schema["properties"]["citation"]["type"] = ["null","string"]
+    # Build schema
+    builder = SchemaBuilder(schema_uri="http://json-schema.org/draft-07/schema#")
+    builder.add_object(data)
 
-# Print or save schema
-with open("version_template_schema.json", "w") as f:
-    json.dump(schema, f, indent=4)
+    # Get schema as dictionary
+    schema = builder.to_schema()
 
+    # Tweak schema
+    schema["properties"]["citation"]["type"] = ["null","string"]
+
+    # Print or save schema
+    with open(SCHEMA_PATH, "w") as f:
+        json.dump(schema, f, indent=4)
+
+if __name__ == "__main__":
+    main()